@@ -0,0 +1,71 @@
+ROWS = 6
+COLUMNS = 7
+
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (-1, 1)]
+
+
+class InvalidMove(ValueError):
+    pass
+
+
+class FastBoard:
+    """
+    Lightweight board for replaying move sequences outside the database.
+
+    Column heights are tracked so a drop is O(1), and only the lines through
+    the last placed piece are checked for a win.
+    """
+
+    def __init__(self):
+        self.board = [[0 for _ in range(COLUMNS)] for _ in range(ROWS)]
+        self.heights = [0] * COLUMNS
+        self.current_player = 1
+        self.moves_played = 0
+        self.is_finished = False
+        self.winner = None
+        self.winning_cells = []
+
+    def play(self, column):
+        if self.is_finished:
+            raise InvalidMove(f"Move {column} played after the game ended")
+        if not isinstance(column, int) or isinstance(column, bool) or not 0 <= column < COLUMNS:
+            raise InvalidMove(f"Invalid column {column!r}")
+        if self.heights[column] == ROWS:
+            raise InvalidMove(f"Column {column} is full")
+
+        player = self.current_player
+        row = ROWS - 1 - self.heights[column]
+        self.board[row][column] = player
+        self.heights[column] += 1
+        self.moves_played += 1
+
+        winning_cells = self._winning_cells(row, column, player)
+        if winning_cells:
+            self.is_finished = True
+            self.winner = player
+            self.winning_cells = winning_cells
+        elif self.moves_played == ROWS * COLUMNS:
+            self.is_finished = True
+        else:
+            self.current_player = 3 - player
+        return player
+
+    def _winning_cells(self, row, column, player):
+        for d_row, d_col in DIRECTIONS:
+            cells = [(row, column)]
+            for sign in (1, -1):
+                r, c = row + sign * d_row, column + sign * d_col
+                while 0 <= r < ROWS and 0 <= c < COLUMNS and self.board[r][c] == player:
+                    cells.append((r, c))
+                    r, c = r + sign * d_row, c + sign * d_col
+            if len(cells) >= 4:
+                cells.sort()
+                return cells[:4]
+        return []
+
+    @classmethod
+    def replay(cls, moves):
+        board = cls()
+        for column in moves:
+            board.play(column)
+        return board
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from algorithms.retention import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_RETENTION_DAYS,
+    MOVE_LOG_PATH,
+    archive_finished_games,
+    rotate_move_log,
+)
+
+
+class Command(BaseCommand):
+    help = 'Archive finished games older than a cutoff into gzip files and delete them in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=DEFAULT_RETENTION_DAYS,
+                            help='Archive finished games not updated for this many days.')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Number of games archived and deleted per transaction.')
+        parser.add_argument('--archive-dir', default=None,
+                            help='Directory for archive files (defaults to GAME_ARCHIVE_DIR).')
+        parser.add_argument('--rotate-log', action='store_true',
+                            help=f'Also compress {MOVE_LOG_PATH} into the archive and start a new one.')
+
+    def handle(self, *args, **options):
+        def progress(archived, batches):
+            self.stdout.write(f"Batch {batches}: {archived} games archived")
+
+        result = archive_finished_games(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            archive_dir=options['archive_dir'],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {result['archived']} games to {result['archive']}"
+        ))
+
+        if options['rotate_log']:
+            size = rotate_move_log(archive_dir=options['archive_dir'])
+            self.stdout.write(self.style.SUCCESS(f"Rotated {size} bytes of {MOVE_LOG_PATH}"))
@@ -0,0 +1,25 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from algorithms.transfer import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, export_games
+
+
+class Command(BaseCommand):
+    help = 'Stream all games and their moves to a file or stdout as NDJSON or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', dest='export_format', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument('--output', default='-', help='Output file, or - for stdout.')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Rows fetched from the database per round trip.')
+
+    def handle(self, *args, **options):
+        content = export_games(options['export_format'], options['chunk_size'])
+        if options['output'] == '-':
+            sys.stdout.writelines(content)
+            return
+
+        with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+            output.writelines(content)
+        self.stderr.write(self.style.SUCCESS(f"Exported games to {options['output']}"))
@@ -0,0 +1,38 @@
+import csv
+import gzip
+
+from django.core.management.base import BaseCommand, CommandError
+
+from algorithms.transfer import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, import_games, read_records
+
+
+class Command(BaseCommand):
+    help = 'Validate and bulk import games from an NDJSON or CSV file (optionally gzipped).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', dest='import_format', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Number of games inserted per transaction.')
+        parser.add_argument('--keep-ids', action='store_true',
+                            help='Reuse exported game ids and skip games that already exist.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            with opener(path, 'rt', newline='', encoding='utf-8') as source:
+                result = import_games(
+                    read_records(source, options['import_format']),
+                    options['batch_size'],
+                    keep_ids=options['keep_ids'],
+                )
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            raise CommandError(f"Could not read {path}: {e}")
+
+        for error in result['errors']:
+            self.stderr.write(f"Record {error['record']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['imported']} games, skipped {result['skipped']} existing "
+            f"and {len(result['errors'])} invalid"
+        ))
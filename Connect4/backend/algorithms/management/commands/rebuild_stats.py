@@ -0,0 +1,24 @@
+import itertools
+
+from django.core.management.base import BaseCommand
+
+from algorithms.retention import iter_archived_records
+from algorithms.stats import rebuild_stats
+from algorithms.transfer import DEFAULT_CHUNK_SIZE, iter_game_records
+
+
+class Command(BaseCommand):
+    help = 'Recompute the game statistics tables from the stored and archived games.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Rows fetched from the database per round trip.')
+        parser.add_argument('--archive-dir', default=None,
+                            help='Directory of game archives to include (defaults to GAME_ARCHIVE_DIR).')
+
+    def handle(self, *args, **options):
+        rebuild_stats(itertools.chain(
+            iter_archived_records(options['archive_dir']),
+            iter_game_records(options['chunk_size']),
+        ))
+        self.stdout.write(self.style.SUCCESS('Rebuilt game statistics'))
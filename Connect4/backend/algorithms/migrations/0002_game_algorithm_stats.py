@@ -0,0 +1,54 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('algorithms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='algorithm',
+            field=models.CharField(blank=True, choices=[('minimax', 'Minimax'), ('negascout', 'NegaScout')], max_length=10, null=True),
+        ),
+        migrations.CreateModel(
+            name='OpeningStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=10, unique=True)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GameLengthStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(max_length=20)),
+                ('difficulty', models.CharField(blank=True, default='', max_length=10)),
+                ('algorithm', models.CharField(blank=True, default='', max_length=10)),
+                ('length', models.IntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('game_type', 'difficulty', 'algorithm', 'length')},
+            },
+        ),
+        migrations.CreateModel(
+            name='OutcomeStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(max_length=20)),
+                ('difficulty', models.CharField(blank=True, default='', max_length=10)),
+                ('algorithm', models.CharField(blank=True, default='', max_length=10)),
+                ('winner', models.IntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('game_type', 'difficulty', 'algorithm', 'winner')},
+            },
+        ),
+    ]
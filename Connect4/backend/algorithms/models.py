@@ -12,9 +12,15 @@ class Game(models.Model):
         ('medium', 'Medium'),
         ('expert', 'Expert'),
     ]
+
+    ALGORITHMS = [
+        ('minimax', 'Minimax'),
+        ('negascout', 'NegaScout'),
+    ]
     
     game_type = models.CharField(max_length=20, choices=GAME_TYPES)
     difficulty = models.CharField(max_length=10, choices=DIFFICULTY_LEVELS, null=True, blank=True)
+    algorithm = models.CharField(max_length=10, choices=ALGORITHMS, null=True, blank=True)
     board_state = models.JSONField(default=list)
     current_player = models.IntegerField(default=1)
     is_finished = models.BooleanField(default=False)
@@ -36,4 +42,31 @@ class GameMove(models.Model):
         ordering = ['created_at']
 
     def __str__(self):
-        return f"Move {self.id} - Game {self.game_id} - Column {self.column}"
\ No newline at end of file
+        return f"Move {self.id} - Game {self.game_id} - Column {self.column}"
+
+class OutcomeStat(models.Model):
+    """Finished games per (game_type, difficulty, algorithm, winner); winner 0 is a draw."""
+    game_type = models.CharField(max_length=20)
+    difficulty = models.CharField(max_length=10, blank=True, default='')
+    algorithm = models.CharField(max_length=10, blank=True, default='')
+    winner = models.IntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['game_type', 'difficulty', 'algorithm', 'winner']
+
+class GameLengthStat(models.Model):
+    """Histogram of finished game lengths in moves."""
+    game_type = models.CharField(max_length=20)
+    difficulty = models.CharField(max_length=10, blank=True, default='')
+    algorithm = models.CharField(max_length=10, blank=True, default='')
+    length = models.IntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['game_type', 'difficulty', 'algorithm', 'length']
+
+class OpeningStat(models.Model):
+    """Finished games starting with a given column sequence, e.g. "334"."""
+    prefix = models.CharField(max_length=10, unique=True)
+    count = models.IntegerField(default=0)
@@ -0,0 +1,148 @@
+import datetime
+import glob
+import gzip
+import json
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Game, GameMove
+
+MOVE_LOG_PATH = 'igre.txt'
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_RETENTION_DAYS = 30
+
+
+def get_archive_dir():
+    return getattr(settings, 'GAME_ARCHIVE_DIR', 'archive')
+
+
+def iter_id_batches(queryset, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Yield lists of game ids, at most batch_size at a time, in id order.
+    """
+    last_id = 0
+    while True:
+        ids = list(
+            queryset.filter(id__gt=last_id)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def delete_games(game_ids):
+    """
+    Delete games and their moves with raw bulk deletes, bypassing the
+    cascade collector so related rows are never loaded into memory.
+    """
+    with transaction.atomic():
+        moves = GameMove.objects.filter(game_id__in=game_ids)
+        moves._raw_delete(moves.db)
+        games = Game.objects.filter(id__in=game_ids)
+        return games._raw_delete(games.db)
+
+
+def _archive_records(game_ids):
+    games = {
+        game['id']: game
+        for game in Game.objects.filter(id__in=game_ids).values(
+            'id', 'game_type', 'difficulty', 'algorithm', 'winner', 'created_at'
+        )
+    }
+    moves = {game_id: [] for game_id in games}
+    for game_id, column in (
+        GameMove.objects.filter(game_id__in=game_ids)
+        .order_by('game_id', 'id')
+        .values_list('game_id', 'column')
+    ):
+        moves[game_id].append(column)
+
+    for game_id in sorted(games):
+        game = games[game_id]
+        yield {
+            'id': game_id,
+            'game_type': game['game_type'],
+            'difficulty': game['difficulty'],
+            'algorithm': game['algorithm'],
+            'winner': game['winner'],
+            'created_at': game['created_at'].isoformat(),
+            'moves': moves[game_id],
+        }
+
+
+def archive_finished_games(days=DEFAULT_RETENTION_DAYS, batch_size=DEFAULT_BATCH_SIZE,
+                           archive_dir=None, progress=None):
+    """
+    Append finished games last updated more than `days` ago to a gzip
+    archive (one JSON line per game, moves as a column sequence) and then
+    delete them, one batch at a time.
+
+    Each batch is written to the archive before it is deleted, so an
+    interrupted run can at worst archive a batch twice, never lose it.
+    Unfinished games are never touched, which keeps the purge safe to run
+    while games are in progress.
+    """
+    archive_dir = archive_dir or get_archive_dir()
+    os.makedirs(archive_dir, exist_ok=True)
+    now = timezone.now()
+    cutoff = now - datetime.timedelta(days=days)
+    archive_path = os.path.join(archive_dir, f"games-{now:%Y%m}.jsonl.gz")
+
+    queryset = Game.objects.filter(is_finished=True, updated_at__lt=cutoff)
+    archived = 0
+    batches = 0
+    for game_ids in iter_id_batches(queryset, batch_size):
+        lines = [json.dumps(record) + '\n' for record in _archive_records(game_ids)]
+        # Every append adds a new gzip member; readers see one continuous stream.
+        with gzip.open(archive_path, 'at', encoding='utf-8') as archive:
+            archive.writelines(lines)
+        archived += delete_games(game_ids)
+        batches += 1
+        if progress:
+            progress(archived, batches)
+
+    return {'archived': archived, 'batches': batches, 'archive': archive_path, 'cutoff': cutoff}
+
+
+def iter_archived_records(archive_dir=None):
+    """
+    Yield the game records stored in every games archive, oldest file first.
+    """
+    archive_dir = archive_dir or get_archive_dir()
+    for path in sorted(glob.glob(os.path.join(archive_dir, 'games-*.jsonl.gz'))):
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def rotate_move_log(log_path=MOVE_LOG_PATH, archive_dir=None):
+    """
+    Move the plain-text move log into a gzip archive and start a fresh one.
+
+    The log is renamed before it is compressed, so moves recorded during
+    the rotation simply land in a new log file.
+    """
+    if not os.path.exists(log_path) or os.path.getsize(log_path) == 0:
+        return 0
+
+    archive_dir = archive_dir or get_archive_dir()
+    os.makedirs(archive_dir, exist_ok=True)
+    now = timezone.now()
+    rotated_path = f"{log_path}.{now:%Y%m%d%H%M%S}"
+    os.replace(log_path, rotated_path)
+
+    archive_path = os.path.join(archive_dir, f"igre-{now:%Y%m}.txt.gz")
+    with open(rotated_path, 'rb') as source, gzip.open(archive_path, 'ab') as archive:
+        size = 0
+        for chunk in iter(lambda: source.read(64 * 1024), b''):
+            archive.write(chunk)
+            size += len(chunk)
+    os.remove(rotated_path)
+    return size
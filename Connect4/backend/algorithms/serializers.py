@@ -6,7 +6,7 @@ class GameSerializer(serializers.ModelSerializer):
         model = Game
         fields = ['id', 'board_state', 'current_player', 'is_finished', 
                  'winner', 'winning_cells', 'game_type', 'difficulty', 
-                 'created_at', 'updated_at']
+                 'algorithm', 'created_at', 'updated_at']
 
 class GameMoveSerializer(serializers.ModelSerializer):
     class Meta:
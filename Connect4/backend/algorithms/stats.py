@@ -0,0 +1,149 @@
+from collections import Counter
+from types import SimpleNamespace
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Length
+
+from .models import GameLengthStat, GameMove, OpeningStat, OutcomeStat
+
+OPENING_DEPTH = 4
+TOP_OPENINGS = 10
+
+
+def _increment(model, counts):
+    for key, amount in counts.items():
+        lookup = dict(key)
+        model.objects.get_or_create(**lookup)
+        model.objects.filter(**lookup).update(count=F('count') + amount)
+
+
+def summarize(game, columns, length=None):
+    """
+    Reduce a finished game to what the summary tables need. `columns` only
+    has to hold the first OPENING_DEPTH moves when `length` is given.
+    """
+    return {
+        'game_type': game.game_type,
+        'difficulty': game.difficulty or '',
+        'algorithm': game.algorithm or '',
+        'winner': game.winner or 0,
+        'length': len(columns) if length is None else length,
+        'opening': ''.join(str(column) for column in columns[:OPENING_DEPTH]),
+    }
+
+
+def record_finished_games(summaries):
+    """
+    Add finished games, as produced by summarize(), to the summary tables.
+
+    The tables are lifetime history: they are only ever incremented, and
+    archiving or deleting games leaves them untouched. Call inside the
+    transaction that finishes the games so a game is counted exactly once.
+    """
+    outcomes = Counter()
+    lengths = Counter()
+    openings = Counter()
+    for summary in summaries:
+        dimensions = (
+            ('game_type', summary['game_type']),
+            ('difficulty', summary['difficulty']),
+            ('algorithm', summary['algorithm']),
+        )
+        outcomes[dimensions + (('winner', summary['winner']),)] += 1
+        lengths[dimensions + (('length', summary['length']),)] += 1
+        opening = summary['opening']
+        for depth in range(1, len(opening) + 1):
+            openings[(('prefix', opening[:depth]),)] += 1
+
+    with transaction.atomic():
+        _increment(OutcomeStat, outcomes)
+        _increment(GameLengthStat, lengths)
+        _increment(OpeningStat, openings)
+
+
+def record_finished_game(game):
+    opening = list(
+        GameMove.objects.filter(game=game).order_by('id').values_list('column', flat=True)[:OPENING_DEPTH]
+    )
+    length = sum(1 for row in game.board_state for cell in row if cell != 0)
+    record_finished_games([summarize(game, opening, length)])
+
+
+def rebuild_stats(records):
+    """
+    Recompute the summary tables from scratch from game records, e.g. to
+    backfill existing history.
+
+    Pass both the stored games (transfer.iter_game_records) and the archived
+    ones (retention.iter_archived_records), or the archived games drop out
+    of the history. Games removed by delete_all cannot be recovered. Records
+    are counted once per id, so archived games restored without keep_ids
+    (and thus under new ids) are counted twice.
+    """
+    def summaries():
+        seen = set()
+        for record in records:
+            if not record.get('is_finished', True) or record['id'] in seen:
+                continue
+            seen.add(record['id'])
+            game = SimpleNamespace(
+                game_type=record['game_type'],
+                difficulty=record.get('difficulty'),
+                algorithm=record.get('algorithm'),
+                winner=record.get('winner'),
+            )
+            yield summarize(game, record['moves'])
+
+    with transaction.atomic():
+        OutcomeStat.objects.all().delete()
+        GameLengthStat.objects.all().delete()
+        OpeningStat.objects.all().delete()
+        record_finished_games(summaries())
+
+
+def get_stats():
+    """
+    Read the summary tables. Their size is bounded by the number of
+    game type/difficulty/algorithm combinations and opening prefixes, not by
+    how many games have been played.
+    """
+    outcomes = {}
+    for stat in OutcomeStat.objects.all():
+        key = (stat.game_type, stat.difficulty, stat.algorithm)
+        entry = outcomes.setdefault(key, {
+            'game_type': stat.game_type,
+            'difficulty': stat.difficulty or None,
+            'algorithm': stat.algorithm or None,
+            'games': 0, 'player_1_wins': 0, 'player_2_wins': 0, 'draws': 0,
+        })
+        entry['games'] += stat.count
+        entry[{0: 'draws', 1: 'player_1_wins', 2: 'player_2_wins'}[stat.winner]] += stat.count
+
+    lengths = {}
+    histograms = {}
+    total_moves = Counter()
+    for stat in GameLengthStat.objects.order_by('length'):
+        key = (stat.game_type, stat.difficulty, stat.algorithm)
+        lengths[stat.length] = lengths.get(stat.length, 0) + stat.count
+        histograms.setdefault(key, {})[stat.length] = stat.count
+        total_moves[key] += stat.length * stat.count
+
+    for key, entry in outcomes.items():
+        entry['average_length'] = round(total_moves[key] / entry['games'], 2) if entry['games'] else None
+        entry['length_histogram'] = histograms.get(key, {})
+
+    openings = {
+        depth: [
+            {'moves': stat.prefix, 'count': stat.count}
+            for stat in OpeningStat.objects.annotate(depth=Length('prefix'))
+            .filter(depth=depth).order_by('-count', 'prefix')[:TOP_OPENINGS]
+        ]
+        for depth in range(1, OPENING_DEPTH + 1)
+    }
+
+    return {
+        'outcomes': list(outcomes.values()),
+        'length_histogram': lengths,
+        'openings': openings,
+    }
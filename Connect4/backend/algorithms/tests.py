@@ -1,3 +1,405 @@
-from django.test import TestCase
+import datetime
+import gzip
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+
+import loadtest
+
+from .board import FastBoard, InvalidMove
+from .models import Game, GameLengthStat, GameMove, OpeningStat, OutcomeStat
+from .retention import archive_finished_games, iter_archived_records
+from .stats import get_stats, rebuild_stats
+from .transfer import CSV_FIELDS, import_games, iter_game_records, read_records
+from .views import GameViewSet
+
+
+def make_game(columns, is_finished=True, days_old=0, **fields):
+    game = Game.objects.create(game_type='human-human', is_finished=is_finished, **fields)
+    for i, column in enumerate(columns):
+        GameMove.objects.create(game=game, column=column, player=i % 2 + 1)
+    if days_old:
+        Game.objects.filter(pk=game.pk).update(
+            updated_at=timezone.now() - datetime.timedelta(days=days_old)
+        )
+    return game
+
+
+class ArchiveFinishedGamesTests(TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir)
+
+    def read_archive(self, path):
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            return [json.loads(line) for line in archive]
+
+    def test_archives_and_deletes_only_old_finished_games(self):
+        old_finished = [make_game([3, 3, 2], days_old=40, winner=1) for _ in range(3)]
+        old_unfinished = make_game([1, 2], is_finished=False, days_old=40)
+        recent_finished = make_game([0, 0], days_old=1)
+
+        result = archive_finished_games(days=30, batch_size=2, archive_dir=self.archive_dir)
+
+        self.assertEqual(result['archived'], 3)
+        self.assertEqual(result['batches'], 2)
+        self.assertEqual(
+            set(Game.objects.values_list('id', flat=True)),
+            {old_unfinished.id, recent_finished.id},
+        )
+        self.assertFalse(GameMove.objects.filter(game_id__in=[g.id for g in old_finished]).exists())
+        self.assertEqual(GameMove.objects.count(), 4)
+
+        records = self.read_archive(result['archive'])
+        self.assertEqual([r['id'] for r in records], [g.id for g in old_finished])
+        self.assertTrue(all(r['moves'] == [3, 3, 2] and r['winner'] == 1 for r in records))
+
+    def test_appends_to_existing_archive(self):
+        make_game([3], days_old=40)
+        first = archive_finished_games(days=30, archive_dir=self.archive_dir)
+        make_game([4], days_old=40)
+        second = archive_finished_games(days=30, archive_dir=self.archive_dir)
+
+        self.assertEqual(first['archive'], second['archive'])
+        self.assertEqual([r['moves'] for r in self.read_archive(second['archive'])], [[3], [4]])
+
+    @mock.patch('algorithms.views.rotate_move_log', return_value=0)
+    @mock.patch('algorithms.views.archive_finished_games')
+    def test_endpoint_rotate_log_flag(self, archive, rotate):
+        archive.return_value = {'archived': 0, 'batches': 0, 'archive': 'games.jsonl.gz', 'cutoff': None}
+        client = APIClient()
+        for value, rotated in (('false', False), ('0', False), ('true', True)):
+            rotate.reset_mock()
+            response = client.post('/api/algorithms/archive/', {'rotate_log': value}, format='multipart')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(rotate.called, rotated)
+
+    def test_nothing_to_archive(self):
+        make_game([3], days_old=1)
+        result = archive_finished_games(days=30, archive_dir=self.archive_dir)
+        self.assertEqual(result['archived'], 0)
+        self.assertFalse(os.path.exists(result['archive']))
+
+
+class FastBoardTests(TestCase):
+    def test_agrees_with_check_win(self):
+        view = GameViewSet()
+        rng = random.Random(0)
+        for _ in range(500):
+            board = FastBoard()
+            while not board.is_finished:
+                player = board.current_player
+                board.play(rng.choice([c for c in range(7) if board.heights[c] < 6]))
+                is_win, cells = view.check_win(board.board, player)
+                self.assertEqual(board.winner == player, is_win)
+                if is_win:
+                    self.assertEqual(sorted(board.winning_cells), sorted(cells))
+            if board.winner is None:
+                self.assertTrue(view.is_board_full(board.board))
+
+    def test_rejects_invalid_moves(self):
+        board = FastBoard.replay([0] * 6)
+        for column in (0, 7, -1, '3', None, True):
+            with self.assertRaises(InvalidMove):
+                board.play(column)
+        board = FastBoard.replay([0, 1, 0, 1, 0, 1, 0])
+        with self.assertRaises(InvalidMove):
+            board.play(2)
+
+
+class ImportGamesTests(TestCase):
+    def test_reports_bad_records_and_imports_good_ones(self):
+        lines = [
+            json.dumps({'game_type': 'human-human', 'moves': [0, 1, 0, 1, 0, 1, 0]}),
+            '{not json',
+            json.dumps({'game_type': 'chess', 'moves': []}),
+            json.dumps({'game_type': 'human-human', 'moves': [0] * 7}),
+            json.dumps({'game_type': 'human-computer', 'difficulty': 'easy',
+                        'algorithm': 'negascout', 'moves': [3, 3]}),
+        ]
+        result = import_games(read_records(lines), batch_size=2)
+
+        self.assertEqual(result['imported'], 2)
+        self.assertEqual([e['record'] for e in result['errors']], [2, 3, 4])
+        finished = Game.objects.get(is_finished=True)
+        self.assertEqual(finished.winner, 1)
+        self.assertEqual(len(finished.winning_cells), 4)
+        self.assertEqual(list(finished.moves.values_list('player', flat=True)), [1, 2, 1, 2, 1, 2, 1])
+        ongoing = Game.objects.get(is_finished=False)
+        self.assertEqual(ongoing.algorithm, 'negascout')
+        self.assertEqual(ongoing.current_player, 1)
+
+    def test_round_trip_keeps_timestamps_and_skips_existing_ids(self):
+        game = make_game([3, 4], days_old=40)
+        Game.objects.filter(pk=game.pk).update(created_at=timezone.now() - datetime.timedelta(days=50))
+        game.refresh_from_db()
+        exported = [json.dumps(record) for record in iter_game_records()]
+
+        result = import_games(read_records(exported), keep_ids=True)
+        self.assertEqual((result['imported'], result['skipped']), (0, 1))
+
+        Game.objects.all().delete()
+        result = import_games(read_records(exported), keep_ids=True)
+        self.assertEqual((result['imported'], result['skipped']), (1, 0))
+        imported = Game.objects.get()
+        self.assertEqual(imported.id, game.id)
+        self.assertEqual(imported.created_at, game.created_at)
+        self.assertEqual(imported.updated_at, game.updated_at)
+
+        result = import_games(read_records(exported))
+        self.assertEqual(result['imported'], 1)
+        self.assertEqual(Game.objects.count(), 2)
+
+
+class ImportEndpointTests(APITestCase):
+    def test_undecodable_file_is_rejected(self):
+        upload = SimpleUploadedFile('games.ndjson', b'\xff\xfe\x00bad')
+        response = self.client.post('/api/algorithms/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+
+    def test_imports_csv_file(self):
+        content = 'game_type,difficulty,algorithm,moves\nhuman-human,,,3344\nhuman-human,,,9\n'
+        upload = SimpleUploadedFile('games.csv', content.encode())
+        response = self.client.post(
+            '/api/algorithms/import/', {'file': upload, 'import_format': 'csv'}, format='multipart'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['imported'], 1)
+        self.assertEqual(len(response.data['errors']), 1)
+
+    def test_games_must_be_objects(self):
+        games = ['x', 5, {'game_type': 'human-human', 'moves': [3]}]
+        response = self.client.post('/api/algorithms/import/', {'games': games}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['imported'], 1)
+        self.assertEqual(
+            response.data['errors'],
+            [{'record': 1, 'error': 'record must be an object'}, {'record': 2, 'error': 'record must be an object'}],
+        )
+
+
+class ExportEndpointTests(APITestCase):
+    def setUp(self):
+        self.games = [
+            make_game([3, 3, 4], winner=None),
+            make_game([], is_finished=False),
+            make_game([0, 1], is_finished=False, algorithm='minimax'),
+        ]
+
+    def export(self, export_format):
+        response = self.client.get('/api/algorithms/export/', {'export_format': export_format})
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode()
+        return response, content
+
+    def test_ndjson(self):
+        response, content = self.export('ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([r['id'] for r in records], [g.id for g in self.games])
+        self.assertEqual([r['moves'] for r in records], [[3, 3, 4], [], [0, 1]])
+        self.assertEqual(records[2]['algorithm'], 'minimax')
+
+    def test_csv_round_trip(self):
+        response, content = self.export('csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = content.splitlines()
+        self.assertEqual(lines[0].split(','), CSV_FIELDS)
+        self.assertEqual([line.rsplit(',', 1)[1] for line in lines[1:]], ['334', '', '01'])
+
+        Game.objects.all().delete()
+        result = import_games(read_records(io.StringIO(content, newline=''), 'csv'), keep_ids=True)
+        self.assertEqual((result['imported'], result['errors']), (3, []))
+        self.assertEqual(
+            [list(Game.objects.get(pk=g.id).moves.values_list('column', flat=True)) for g in self.games],
+            [[3, 3, 4], [], [0, 1]],
+        )
+
+    def test_invalid_format(self):
+        response = self.client.get('/api/algorithms/export/', {'export_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+
+@mock.patch.object(GameViewSet, 'record_move_to_file')
+class StatsTests(APITestCase):
+    def play(self, game_id, columns, **data):
+        for column in columns:
+            response = self.client.post(
+                f'/api/algorithms/{game_id}/make_move/', {'column': column, **data}, format='json'
+            )
+            self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def create(self, **data):
+        response = self.client.post('/api/algorithms/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def test_finishing_a_game_updates_stats(self, record_move_to_file):
+        game_id = self.create(game_type='human-human')
+        self.play(game_id, [0, 1, 0, 1, 0, 1])
+        self.assertFalse(OutcomeStat.objects.exists())
+
+        self.play(game_id, [0])
+        outcome = OutcomeStat.objects.get()
+        self.assertEqual(
+            (outcome.game_type, outcome.difficulty, outcome.algorithm, outcome.winner, outcome.count),
+            ('human-human', '', '', 1, 1),
+        )
+        self.assertEqual(GameLengthStat.objects.get().length, 7)
+        self.assertEqual(
+            dict(OpeningStat.objects.values_list('prefix', 'count')),
+            {'0': 1, '01': 1, '010': 1, '0101': 1},
+        )
+
+        game_id = self.create(game_type='human-human')
+        self.play(game_id, [0, 1, 0, 1, 0, 1, 0])
+        stats = get_stats()
+        self.assertEqual(stats['outcomes'][0]['games'], 2)
+        self.assertEqual(stats['outcomes'][0]['player_1_wins'], 2)
+        self.assertEqual(stats['outcomes'][0]['average_length'], 7)
+        self.assertEqual(stats['outcomes'][0]['length_histogram'], {7: 2})
+        self.assertEqual(stats['openings'][1], [{'moves': '0', 'count': 2}])
+
+        game_id = self.create(game_type='human-computer', difficulty='easy', algorithm='negascout')
+        self.play(game_id, [6, 0, 1, 0, 1, 0, 1, 0], skip_computer_move=True)
+        outcomes = {
+            (entry['game_type'], entry['algorithm']): entry for entry in get_stats()['outcomes']
+        }
+        self.assertEqual(outcomes[('human-human', None)]['length_histogram'], {7: 2})
+        self.assertEqual(outcomes[('human-computer', 'negascout')]['length_histogram'], {8: 1})
+        self.assertEqual(outcomes[('human-computer', 'negascout')]['player_2_wins'], 1)
+        self.assertEqual(get_stats()['length_histogram'], {7: 2, 8: 1})
+
+    def test_recorded_algorithm_is_used(self, record_move_to_file):
+        game_id = self.create(game_type='human-computer', difficulty='easy', algorithm='minimax')
+        with mock.patch.object(GameViewSet, 'get_computer_agent', wraps=GameViewSet().get_computer_agent) as agent:
+            self.play(game_id, [3], algorithm='negascout')
+        agent.assert_called_with('minimax', 'easy')
+        self.assertEqual(Game.objects.get(pk=game_id).algorithm, 'minimax')
+
+    def test_stats_survive_archiving_and_rebuild(self, record_move_to_file):
+        archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_dir)
+        for _ in range(2):
+            self.play(self.create(game_type='human-human'), [0, 1, 0, 1, 0, 1, 0])
+        Game.objects.update(updated_at=timezone.now() - datetime.timedelta(days=1))
+        archive_finished_games(days=0, archive_dir=archive_dir)
+        self.assertFalse(Game.objects.exists())
+        self.assertEqual(OutcomeStat.objects.get().count, 2)
+
+        self.play(self.create(game_type='human-human'), [0, 1, 0, 1, 0, 1, 0])
+        rebuild_stats(list(iter_archived_records(archive_dir)) + list(iter_game_records()))
+        self.assertEqual(OutcomeStat.objects.get().count, 3)
+        self.assertEqual(OpeningStat.objects.get(prefix='0').count, 3)
+
+    def test_restoring_archived_games_does_not_recount_them(self, record_move_to_file):
+        archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_dir)
+        for _ in range(2):
+            self.play(self.create(game_type='human-human'), [0, 1, 0, 1, 0, 1, 0])
+        Game.objects.update(updated_at=timezone.now() - datetime.timedelta(days=1))
+        result = archive_finished_games(days=0, archive_dir=archive_dir)
+
+        with gzip.open(result['archive'], 'rt', encoding='utf-8') as archive:
+            lines = archive.readlines()
+        self.assertEqual(import_games(read_records(lines), keep_ids=True)['imported'], 2)
+        self.assertEqual(OutcomeStat.objects.get().count, 2)
+        self.assertEqual(OpeningStat.objects.get(prefix='0').count, 2)
+
+        rebuild_stats(list(iter_archived_records(archive_dir)) + list(iter_game_records()))
+        self.assertEqual(OutcomeStat.objects.get().count, 2)
+
+        Game.objects.all().delete()
+        self.assertEqual(import_games(read_records(lines))['imported'], 2)
+        self.assertEqual(OutcomeStat.objects.get().count, 2)
+
+        import_games(read_records([json.dumps({'game_type': 'human-human', 'moves': [0, 1, 0, 1, 0, 1, 0]})]))
+        self.assertEqual(OutcomeStat.objects.get().count, 3)
+
+
+class LoadTestTests(SimpleTestCase):
+    def test_percentile(self):
+        self.assertIsNone(loadtest.percentile([], 0.5))
+        values = list(range(1, 101))
+        self.assertEqual(loadtest.percentile(values, 0.50), 50)
+        self.assertEqual(loadtest.percentile(values, 0.95), 95)
+        self.assertEqual(loadtest.percentile(values, 0.99), 99)
+        self.assertEqual(loadtest.percentile([7], 0.99), 7)
+        self.assertEqual(loadtest.percentile([1, 2, 3], 0.5), 2)
+
+    def test_load_recorded_games(self):
+        lines = [
+            'Game ID: 1, Player: 1, Column: 3, Time: 2025-01-26 16:28:53',
+            'Game ID: 2, Player: 1, Column: 0, Time: 2025-01-26 16:28:53',
+            'Game ID: 1, Player: 2, Column: 4, Time: 2025-01-26 16:28:54',
+            'garbage',
+        ]
+        lines += [f'Game ID: 2, Player: 1, Column: 0, Time: 2025-01-26 16:28:5{i}' for i in range(6)]
+        lines.append('Game ID: 3, Player: 1, Column: 9, Time: 2025-01-26 16:28:59')
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as log:
+            log.write('\n'.join(lines) + '\n')
+        self.addCleanup(os.remove, log.name)
+
+        # Game 2 is cut at its seventh move (column 0 is full); game 3 has no legal move
+        self.assertEqual(loadtest.load_recorded_games(log.name), [[3, 4], [0] * 6])
+
+    def assertArgsRejected(self, *argv):
+        with mock.patch('sys.stderr'), self.assertRaises(SystemExit):
+            loadtest.parse_args(list(argv))
+
+    def test_parse_args(self):
+        args = loadtest.parse_args(['--mix', '1:2:0', '--difficulties', 'easy', '--algorithms', 'negascout'])
+        self.assertEqual(args.mix, [1.0, 2.0, 0.0])
+        self.assertEqual(args.difficulties, ['easy'])
+        self.assertEqual(args.algorithms, ['negascout'])
+        self.assertEqual(args.source, 'self-play')
+
+        self.assertArgsRejected('--mix', 'a:1:1')
+        self.assertArgsRejected('--mix=-1:2:1')
+        self.assertArgsRejected('--mix', '0:0:0')
+        self.assertArgsRejected('--mix', '1:1')
+        self.assertArgsRejected('--difficulties', 'easy,hard')
+        self.assertArgsRejected('--algorithms', 'mcts')
+        self.assertArgsRejected('--concurrency', '0')
+        self.assertArgsRejected('--duration', '0')
+        self.assertArgsRejected('--timeout', '-1')
+        self.assertArgsRejected('--self-play-games', '0')
+
+    def test_metrics_report(self):
+        metrics = loadtest.Metrics()
+        for i in range(1, 101):
+            metrics.record('make_move', i / 1000, 200 if i <= 90 else 500)
+        metrics.record('create', 0.005, 201)
+        metrics.record('create', 0.010, 599)
+
+        report = metrics.report(2.0, {'seed': 0})
+        self.assertEqual(report['requests'], 102)
+        self.assertEqual(report['throughput_rps'], 51.0)
+        self.assertEqual(report['error_rate'], round(11 / 102, 4))
+
+        make_move = report['endpoints']['make_move']
+        self.assertEqual(make_move['error_rate'], 0.1)
+        self.assertEqual(make_move['statuses'], {'200': 90, '500': 10})
+        self.assertEqual(
+            make_move['latency_ms'],
+            {'mean': 50.5, 'p50': 50.0, 'p95': 95.0, 'p99': 99.0, 'max': 100.0},
+        )
+        create = report['endpoints']['create']
+        self.assertEqual(create['error_rate'], 0.5)
+        self.assertEqual(create['latency_ms']['p50'], 5.0)
+        self.assertEqual(create['latency_ms']['p99'], 10.0)
+
+    def test_self_play_is_deterministic(self):
+        first = loadtest.generate_self_play_games(5, random.Random(3))
+        self.assertEqual(first, loadtest.generate_self_play_games(5, random.Random(3)))
+        self.assertTrue(all(FastBoard.replay(columns).is_finished for columns in first))
@@ -0,0 +1,247 @@
+import csv
+import datetime
+import io
+import json
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .board import FastBoard, InvalidMove
+from .models import Game, GameMove
+from .stats import record_finished_games, summarize
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+CSV_FIELDS = ['id', 'game_type', 'difficulty', 'algorithm', 'is_finished', 'winner', 'created_at', 'updated_at', 'moves']
+DEFAULT_CHUNK_SIZE = 1000
+
+GAME_TYPES = {value for value, _ in Game.GAME_TYPES}
+DIFFICULTY_LEVELS = {value for value, _ in Game.DIFFICULTY_LEVELS}
+ALGORITHMS = {value for value, _ in Game.ALGORITHMS}
+
+
+def iter_game_records(chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield one dict per game with its move sequence attached.
+
+    Games and moves are streamed side by side in game id order and merged,
+    so neither table is ever held in memory as a whole.
+    """
+    games = (
+        Game.objects.order_by('id')
+        .values('id', 'game_type', 'difficulty', 'algorithm', 'is_finished', 'winner', 'created_at', 'updated_at')
+        .iterator(chunk_size=chunk_size)
+    )
+    moves = (
+        GameMove.objects.order_by('game_id', 'id')
+        .values_list('game_id', 'column')
+        .iterator(chunk_size=chunk_size)
+    )
+    pending = next(moves, None)
+
+    for game in games:
+        # Skip moves of games deleted between the two queries
+        while pending is not None and pending[0] < game['id']:
+            pending = next(moves, None)
+        columns = []
+        while pending is not None and pending[0] == game['id']:
+            columns.append(pending[1])
+            pending = next(moves, None)
+        game['created_at'] = game['created_at'].isoformat()
+        game['updated_at'] = game['updated_at'].isoformat()
+        game['moves'] = columns
+        yield game
+
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record) + '\n'
+
+
+def iter_csv(records):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for record in records:
+        writer.writerow({**record, 'moves': ''.join(str(column) for column in record['moves'])})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
+def export_games(export_format='ndjson', chunk_size=DEFAULT_CHUNK_SIZE):
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError('Invalid export format')
+    records = iter_game_records(chunk_size)
+    if export_format == 'csv':
+        return iter_csv(records)
+    return iter_ndjson(records)
+
+
+def _csv_record(row):
+    return {**row, 'moves': [int(column) for column in row.get('moves') or '']}
+
+
+def read_records(lines, import_format='ndjson'):
+    """
+    Pair each raw NDJSON line or CSV row with its parser, so that a bad
+    line is reported by import_games instead of aborting the whole import.
+    """
+    if import_format not in EXPORT_FORMATS:
+        raise ValueError('Invalid import format')
+    if import_format == 'csv':
+        return ((_csv_record, row) for row in csv.DictReader(lines))
+    return ((json.loads, line) for line in lines if line.strip())
+
+
+def _parse_timestamp(value):
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"Invalid timestamp {value!r}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, datetime.timezone.utc)
+    return parsed
+
+
+def build_game(record, keep_id=False):
+    """
+    Validate one imported record and return an unsaved Game, the list of
+    (column, player) moves replayed on a FastBoard, the recorded
+    (created_at, updated_at) timestamps, if any, and the record's own id.
+    """
+    if not isinstance(record, dict):
+        raise ValueError('record must be an object')
+    game_type = record.get('game_type')
+    if game_type not in GAME_TYPES:
+        raise ValueError(f"Invalid game type {game_type!r}")
+    difficulty = record.get('difficulty') or None
+    if difficulty is not None and difficulty not in DIFFICULTY_LEVELS:
+        raise ValueError(f"Invalid difficulty {difficulty!r}")
+    algorithm = record.get('algorithm') or None
+    if algorithm is not None and algorithm not in ALGORITHMS:
+        raise ValueError(f"Invalid algorithm {algorithm!r}")
+    created_at = _parse_timestamp(record.get('created_at'))
+    updated_at = _parse_timestamp(record.get('updated_at')) or created_at
+    source_id = int(record['id']) if record.get('id') not in (None, '') else None
+    moves = record.get('moves')
+    if not isinstance(moves, list):
+        raise ValueError('moves must be a list of columns')
+
+    board = FastBoard()
+    played = []
+    for column in moves:
+        try:
+            played.append((column, board.play(column)))
+        except InvalidMove as e:
+            raise ValueError(str(e))
+
+    game = Game(
+        id=source_id if keep_id else None,
+        game_type=game_type,
+        difficulty=difficulty,
+        algorithm=algorithm,
+        board_state=board.board,
+        current_player=board.current_player,
+        is_finished=board.is_finished,
+        winner=board.winner,
+        winning_cells=board.winning_cells,
+    )
+    return game, played, (created_at, updated_at), source_id
+
+
+def _insert_batch(batch, keep_ids=False):
+    """
+    Insert one batch and return (imported, skipped). With keep_ids, games
+    whose id already exists, in the database or earlier in the batch, are
+    skipped.
+    """
+    with transaction.atomic():
+        if keep_ids:
+            existing = set(
+                Game.objects.filter(id__in=[game.id for game, _, _, _ in batch if game.id is not None])
+                .values_list('id', flat=True)
+            )
+            kept = []
+            for entry in batch:
+                game_id = entry[0].id
+                if game_id is None or game_id not in existing:
+                    kept.append(entry)
+                    if game_id is not None:
+                        existing.add(game_id)
+            skipped = len(batch) - len(kept)
+            batch = kept
+        else:
+            skipped = 0
+
+        games = Game.objects.bulk_create([game for game, _, _, _ in batch])
+        GameMove.objects.bulk_create(
+            [
+                GameMove(game=game, column=column, player=player)
+                for game, played, _, _ in batch
+                for column, player in played
+            ],
+            batch_size=DEFAULT_CHUNK_SIZE,
+        )
+
+        # bulk_create always stamps auto_now fields with the current time,
+        # so put the recorded timestamps back; bulk_update leaves them alone.
+        restamped = []
+        for game, _, (created_at, updated_at), _ in batch:
+            if created_at is not None:
+                game.created_at = created_at
+                game.updated_at = updated_at
+                restamped.append(game)
+        if restamped:
+            Game.objects.bulk_update(restamped, ['created_at', 'updated_at'], batch_size=DEFAULT_CHUNK_SIZE)
+
+        # Records that carry an id come from an export or archive: they were
+        # counted when they finished, or are backfilled by rebuild_stats.
+        record_finished_games(
+            summarize(game, [column for column, _ in played])
+            for game, played, _, source_id in batch if game.is_finished and source_id is None
+        )
+    return len(games), skipped
+
+
+def import_games(records, batch_size=DEFAULT_CHUNK_SIZE, keep_ids=False):
+    """
+    Validate and insert game records in batches with bulk_create.
+
+    `records` yields (parse, raw) pairs as produced by read_records.
+    Recorded created_at/updated_at timestamps are kept. By default every
+    record becomes a new game, so importing the same export twice duplicates
+    it; with keep_ids the exported ids are reused and records whose id
+    already exists are skipped. Only finished games without an id are added
+    to the statistics tables, so restoring exported or archived games never
+    counts them twice. Restore archives with keep_ids, so that rebuild_stats
+    can match restored games to their archived copies.
+
+    Invalid records are skipped and reported by their position in the input;
+    valid ones are still imported. Errors reading the input itself (bad
+    encoding, malformed CSV) propagate, after earlier batches are committed.
+    """
+    imported = 0
+    skipped = 0
+    errors = []
+    batch = []
+
+    def flush():
+        nonlocal imported, skipped
+        inserted, duplicates = _insert_batch(batch, keep_ids)
+        imported += inserted
+        skipped += duplicates
+        batch.clear()
+
+    for index, (parse, raw) in enumerate(records, start=1):
+        try:
+            batch.append(build_game(parse(raw), keep_ids))
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append({'record': index, 'error': str(e)})
+            continue
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return {'imported': imported, 'skipped': skipped, 'errors': errors}
@@ -1,9 +1,19 @@
+import csv
+import io
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Game, GameMove
 from .serializers import GameSerializer, GameMoveSerializer
 from .agents import MinimaxABAgent, NegascoutAgent
+from .retention import (
+    DEFAULT_BATCH_SIZE, DEFAULT_RETENTION_DAYS,
+    archive_finished_games, delete_games, iter_id_batches, rotate_move_log,
+)
+from .transfer import export_games, import_games, read_records
+from .stats import get_stats, record_finished_game
 import datetime
 
 class GameViewSet(viewsets.ModelViewSet):
@@ -17,6 +27,10 @@ class GameViewSet(viewsets.ModelViewSet):
             board = [[0 for _ in range(7)] for _ in range(6)]
             serializer.validated_data['board_state'] = board
             serializer.validated_data['winning_cells'] = []
+            if serializer.validated_data['game_type'] == 'human-human':
+                serializer.validated_data['algorithm'] = None
+            elif not serializer.validated_data.get('algorithm'):
+                serializer.validated_data['algorithm'] = 'minimax'
             game = serializer.save()
 
             # Apply initial moves if provided
@@ -38,8 +52,7 @@ class GameViewSet(viewsets.ModelViewSet):
 
             # Only make first computer move if no initial moves were provided and not from file
             elif game.game_type == 'computer-computer' and not from_file:
-                algorithm = request.data.get('algorithm', 'minimax')
-                agent = self.get_computer_agent(algorithm, game.difficulty)
+                agent = self.get_computer_agent(game.algorithm, game.difficulty)
                 computer_move = agent.get_chosen_column(game.board_state)
                 self.apply_move(game, computer_move)
 
@@ -54,7 +67,10 @@ class GameViewSet(viewsets.ModelViewSet):
             return Response({"error": "Game is already finished"}, status=status.HTTP_400_BAD_REQUEST)
 
         column = request.data.get('column')
-        algorithm = request.data.get('algorithm', 'minimax')
+        # The recorded algorithm wins; the request only fills it in for legacy games
+        algorithm = game.algorithm or request.data.get('algorithm', 'minimax')
+        if game.game_type != 'human-human' and not game.algorithm and algorithm in dict(Game.ALGORITHMS):
+            game.algorithm = algorithm
         from_file = request.data.get('is_from_file', False)
         skip_computer_move = request.data.get('skip_computer_move', False)
         
@@ -104,11 +120,16 @@ class GameViewSet(viewsets.ModelViewSet):
         else:
             raise ValueError('Invalid algorithm type')
 
+    def get_flag(self, request, name):
+        # Form posts send booleans as strings, so "false" must not count as set
+        return str(request.data.get(name, False)).lower() in ('1', 'true', 'yes')
+
     def is_valid_move(self, board, column):
         if column is None or not isinstance(column, (int, float)) or column < 0 or column >= 7:
             return False
         return board[0][column] == 0
 
+    @transaction.atomic
     def apply_move(self, game, column, from_file=False):
         board = game.board_state
         current_player = game.current_player
@@ -140,6 +161,9 @@ class GameViewSet(viewsets.ModelViewSet):
             column=column,
             player=current_player
         )
+
+        if game.is_finished:
+            record_finished_game(game)
         
         # Only record to file if not reading from file
         if not from_file:
@@ -200,5 +224,74 @@ class GameViewSet(viewsets.ModelViewSet):
         """
         Delete all games.
         """
-        deleted_count, _ = Game.objects.all().delete()
-        return Response({"message": f"Deleted {deleted_count} games."}, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        deleted_count = 0
+        for game_ids in iter_id_batches(Game.objects.all(), DEFAULT_BATCH_SIZE):
+            deleted_count += delete_games(game_ids)
+        return Response({"message": f"Deleted {deleted_count} games."}, status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['post'])
+    def archive(self, request):
+        """
+        Archive finished games older than `days` and delete them in batches.
+        """
+        try:
+            days = int(request.data.get('days', DEFAULT_RETENTION_DAYS))
+            batch_size = int(request.data.get('batch_size', DEFAULT_BATCH_SIZE))
+        except (TypeError, ValueError):
+            return Response({"error": "days and batch_size must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        if days < 0 or batch_size < 1:
+            return Response({"error": "days must be >= 0 and batch_size >= 1"}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = archive_finished_games(days=days, batch_size=batch_size)
+        if self.get_flag(request, 'rotate_log'):
+            result['rotated_log_bytes'] = rotate_move_log()
+        result['archive'] = str(result['archive'])
+        return Response(result)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream every game with its move sequence as NDJSON or CSV.
+        """
+        export_format = request.query_params.get('export_format', 'ndjson')
+        try:
+            content = export_games(export_format)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        content_type = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="games.{export_format}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request):
+        """
+        Bulk import games from an uploaded NDJSON/CSV `file` or a JSON `games` list.
+        With `keep_ids`, exported ids are reused and games that already exist are skipped.
+        """
+        upload = request.FILES.get('file')
+        if upload is not None:
+            import_format = request.data.get('import_format', 'ndjson')
+            try:
+                records = read_records(io.TextIOWrapper(upload, encoding='utf-8', newline=''), import_format)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            games = request.data.get('games')
+            if not isinstance(games, list):
+                return Response({"error": "Provide a file or a list of games"}, status=status.HTTP_400_BAD_REQUEST)
+            records = ((lambda game: game, game) for game in games)
+
+        keep_ids = self.get_flag(request, 'keep_ids')
+        try:
+            result = import_games(records, keep_ids=keep_ids)
+        except (UnicodeDecodeError, csv.Error) as e:
+            return Response({"error": f"Could not read import file: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Outcome counts, game lengths and common openings from the summary tables.
+        """
+        return Response(get_stats())
@@ -25,7 +25,7 @@ SECRET_KEY = 'django-insecure-!tz@q2^_fvifv7g%3j&bt3+_&)yj(j60zy9t6n28t(uc&)l3s*
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
-ALLOWED_HOSTS = ['desirable-nourishment-production.up.railway.app','connect4-game.up.railway.app']
+ALLOWED_HOSTS = ['desirable-nourishment-production.up.railway.app','connect4-game.up.railway.app','localhost','127.0.0.1']
 
 
 # Application definition
@@ -127,6 +127,9 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Compressed archives of purged games and rotated move logs
+GAME_ARCHIVE_DIR = BASE_DIR / 'archive'
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+"""
+Load generator for the Connect 4 API.
+
+Runs many asyncio HTTP clients against a running backend (e.g.
+`python manage.py runserver` or gunicorn) and replays randomly generated
+self-play games (deterministic for a given --seed) or games from a move log
+snapshot. Prints throughput, latency percentiles per
+endpoint and error rates as JSON so runs can be compared between builds.
+
+    python loadtest.py --concurrency 20 --duration 60 --mix 1:2:1 --difficulties easy,medium
+
+Only the standard library is used. The server appends every move it plays
+to its own igre.txt, so replay a copy of it rather than the live file, or
+the replay set changes between runs.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from algorithms.board import COLUMNS, FastBoard, InvalidMove
+
+GAME_TYPES = ['human-human', 'human-computer', 'computer-computer']
+DIFFICULTIES = ['easy', 'medium', 'expert']
+ALGORITHMS = ['minimax', 'negascout']
+MOVE_LOG_LINE = re.compile(r"Game ID: (\d+), Player: (\d+), Column: (\d+)")
+
+
+def load_recorded_games(path):
+    """
+    Read move sequences from the server move log, cut at the first move that
+    is not legal on a replayed board.
+    """
+    games = defaultdict(list)
+    with open(path, encoding='utf-8', errors='ignore') as log:
+        for line in log:
+            match = MOVE_LOG_LINE.search(line)
+            if match:
+                games[int(match.group(1))].append(int(match.group(3)))
+
+    sequences = []
+    for columns in games.values():
+        board = FastBoard()
+        played = []
+        for column in columns:
+            try:
+                board.play(column)
+            except InvalidMove:
+                break
+            played.append(column)
+        if played:
+            sequences.append(played)
+    return sequences
+
+
+def generate_self_play_games(count, rng):
+    sequences = []
+    for _ in range(count):
+        board = FastBoard()
+        columns = []
+        while not board.is_finished:
+            column = rng.choice([c for c in range(COLUMNS) if board.heights[c] < 6])
+            board.play(column)
+            columns.append(column)
+        sequences.append(columns)
+    return sequences
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    # Nearest-rank percentile
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class Metrics:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.games = defaultdict(lambda: {'started': 0, 'finished': 0, 'failed': 0})
+
+    def record(self, endpoint, latency, status):
+        self.latencies[endpoint].append(latency)
+        self.statuses[endpoint][status] += 1
+        if not 200 <= status < 300:
+            self.errors[endpoint] += 1
+
+    def report(self, elapsed, config):
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            endpoints[endpoint] = {
+                'requests': len(values),
+                'throughput_rps': round(len(values) / elapsed, 2),
+                'error_rate': round(self.errors[endpoint] / len(values), 4),
+                'statuses': {str(status): count for status, count in sorted(self.statuses[endpoint].items())},
+                'latency_ms': {
+                    'mean': round(sum(values) / len(values) * 1000, 2),
+                    'p50': round(percentile(values, 0.50) * 1000, 2),
+                    'p95': round(percentile(values, 0.95) * 1000, 2),
+                    'p99': round(percentile(values, 0.99) * 1000, 2),
+                    'max': round(values[-1] * 1000, 2),
+                },
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            'config': config,
+            'elapsed_seconds': round(elapsed, 2),
+            'requests': total,
+            'throughput_rps': round(total / elapsed, 2) if elapsed else None,
+            'error_rate': round(sum(self.errors.values()) / total, 4) if total else None,
+            'endpoints': endpoints,
+            'games': dict(self.games),
+        }
+
+
+class HttpClient:
+    """
+    Minimal HTTP/1.1 JSON client over one keep-alive connection, reconnecting
+    whenever the server closes it.
+    """
+
+    def __init__(self, base_url, timeout):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.prefix = url.path.rstrip('/')
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        return await asyncio.wait_for(self._request(method, path, payload), self.timeout)
+
+    async def _request(self, method, path, payload):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        body = json.dumps(payload).encode() if payload is not None else b''
+        head = (
+            f"{method} {self.prefix}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            "Accept: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        )
+        self.writer.write(head.encode() + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by server')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            data = b''
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                data += await self.reader.readexactly(size)
+                await self.reader.readline()
+        elif 'content-length' in headers:
+            data = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            data = await self.reader.read()
+            headers['connection'] = 'close'
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        try:
+            return status, json.loads(data) if data else None
+        except ValueError:
+            return status, None
+
+
+class Player:
+    """One virtual client playing whole games back to back."""
+
+    def __init__(self, client, metrics, sequences, config, rng):
+        self.client = client
+        self.metrics = metrics
+        self.sequences = sequences
+        self.config = config
+        self.rng = rng
+
+    async def call(self, endpoint, method, path, payload=None):
+        started = time.perf_counter()
+        try:
+            status, data = await self.client.request(method, path, payload)
+        except (OSError, asyncio.TimeoutError, ConnectionError, ValueError, IndexError,
+                asyncio.IncompleteReadError):
+            await self.client.close()
+            status, data = 599, None
+        self.metrics.record(endpoint, time.perf_counter() - started, status)
+        return status, data
+
+    async def play(self, game_type, difficulty):
+        key = f"{game_type}/{difficulty}" if game_type != 'human-human' else game_type
+        self.metrics.games[key]['started'] += 1
+        payload = {'game_type': game_type}
+        if game_type != 'human-human':
+            payload['difficulty'] = difficulty
+            payload['algorithm'] = self.rng.choice(self.config['algorithms'])
+
+        status, game = await self.call('create', 'POST', '/', payload)
+        if status != 201 or not game:
+            self.metrics.games[key]['failed'] += 1
+            return
+
+        columns = iter(self.rng.choice(self.sequences))
+        move_path = f"/{game['id']}/make_move/"
+        while not game['is_finished']:
+            if game_type == 'computer-computer':
+                move = {}
+            else:
+                move = {'column': self.next_column(game['board_state'], columns)}
+            status, data = await self.call('make_move', 'POST', move_path, move)
+            if status != 200 or not data:
+                self.metrics.games[key]['failed'] += 1
+                return
+            game = data
+        self.metrics.games[key]['finished'] += 1
+
+    def next_column(self, board, columns):
+        # Follow the recorded sequence while it fits the live board
+        for column in columns:
+            if board[0][column] == 0:
+                return column
+        return self.rng.choice([c for c in range(COLUMNS) if board[0][c] == 0])
+
+    async def run(self, deadline, budget):
+        try:
+            while time.monotonic() < deadline and budget.take():
+                game_type = self.rng.choices(GAME_TYPES, weights=self.config['mix'])[0]
+                await self.play(game_type, self.rng.choice(self.config['difficulties']))
+        finally:
+            await self.client.close()
+
+
+class GameBudget:
+    def __init__(self, limit):
+        self.remaining = limit
+
+    def take(self):
+        if self.remaining is None:
+            return True
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+async def run(args, sequences):
+    config = {
+        'url': args.url,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'games': args.games,
+        'mix': args.mix,
+        'difficulties': args.difficulties,
+        'algorithms': args.algorithms,
+        'source': args.source,
+        'sequences': len(sequences),
+        'seed': args.seed,
+    }
+    metrics = Metrics()
+    budget = GameBudget(args.games)
+    started = time.monotonic()
+    deadline = started + args.duration
+    players = [
+        Player(HttpClient(args.url, args.timeout), metrics, sequences, config, random.Random(args.seed + i))
+        for i in range(args.concurrency)
+    ]
+    await asyncio.gather(*(player.run(deadline, budget) for player in players))
+    return metrics.report(time.monotonic() - started, config)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Replay Connect 4 games against a running API server.')
+    parser.add_argument('--url', default='http://127.0.0.1:8000/api/algorithms',
+                        help='Base URL of the game endpoints.')
+    parser.add_argument('--concurrency', type=int, default=10, help='Number of concurrent clients.')
+    parser.add_argument('--duration', type=float, default=30, help='Stop starting new games after this many seconds.')
+    parser.add_argument('--games', type=int, default=None, help='Stop after this many games in total.')
+    parser.add_argument('--mix', default='1:1:1',
+                        help='Relative weights of human-human:human-computer:computer-computer games.')
+    parser.add_argument('--difficulties', default='easy,medium,expert')
+    parser.add_argument('--algorithms', default='minimax,negascout')
+    parser.add_argument('--source', default='self-play',
+                        help='"self-play" to generate random games, or a copy of igre.txt to replay.')
+    parser.add_argument('--self-play-games', type=int, default=200,
+                        help='Number of games to generate when replaying self-play.')
+    parser.add_argument('--timeout', type=float, default=60, help='Per-request timeout in seconds.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='-', help='Report file, or - for stdout.')
+    args = parser.parse_args(argv)
+
+    try:
+        args.mix = [float(weight) for weight in args.mix.split(':')]
+    except ValueError:
+        parser.error('--mix needs three non-negative weights, e.g. 1:2:1, not all zero')
+    if len(args.mix) != len(GAME_TYPES) or any(weight < 0 for weight in args.mix) or sum(args.mix) <= 0:
+        parser.error('--mix needs three non-negative weights, e.g. 1:2:1, not all zero')
+    args.difficulties = args.difficulties.split(',')
+    args.algorithms = args.algorithms.split(',')
+    if not set(args.difficulties) <= set(DIFFICULTIES):
+        parser.error(f"--difficulties must be chosen from {', '.join(DIFFICULTIES)}")
+    if not set(args.algorithms) <= set(ALGORITHMS):
+        parser.error(f"--algorithms must be chosen from {', '.join(ALGORITHMS)}")
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+    if args.games is not None and args.games < 1:
+        parser.error('--games must be at least 1')
+    if args.self_play_games < 1:
+        parser.error('--self-play-games must be at least 1')
+    if args.duration <= 0:
+        parser.error('--duration must be positive')
+    if args.timeout <= 0:
+        parser.error('--timeout must be positive')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.source == 'self-play':
+        sequences = generate_self_play_games(args.self_play_games, random.Random(args.seed))
+    else:
+        sequences = load_recorded_games(args.source)
+    if not sequences:
+        sys.exit(f"No games to replay in {args.source}")
+
+    report = asyncio.run(run(args, sequences))
+    output = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()